@@ -11,24 +11,53 @@ Then run this app: python chat_app_mcp.py
 """
 
 import os
+import json
+import queue
 import asyncio
+import hashlib
 import threading
+import weakref
+from contextlib import AsyncExitStack, asynccontextmanager
+from datetime import timedelta
+from typing import Any, AsyncIterator, Callable, Iterator
+import fastjsonschema
 import gradio as gr
 from langchain_openai import ChatOpenAI
 from langchain.agents import create_agent
 from langchain_core.tools import StructuredTool
 from langchain_core.messages import HumanMessage, AIMessage
-from pydantic import SecretStr, Field, create_model
+from pydantic import BaseModel, SecretStr, Field, TypeAdapter, create_model
+from typing_extensions import NotRequired, TypedDict
 from dotenv import load_dotenv
 
-from mcp import ClientSession
+from mcp import ClientSession, types
 from mcp.client.sse import sse_client
 
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
 load_dotenv()
 
 # MCP Server URL - change this if running on a different host/port
 MCP_SERVER_URL = "http://localhost:8000/sse"
 
+# Number of MCP sessions opened so tool calls can run in parallel
+MCP_POOL_SIZE = int(os.getenv("MCP_POOL_SIZE", "4"))
+
+# Longest a single MCP tool call may take before it fails
+TOOL_CALL_TIMEOUT = timedelta(seconds=30)
+
+# Longest a whole agent turn (LLM and tool calls together) may take
+CHAT_TURN_TIMEOUT_SECONDS = 120
+
+# How long shutdown waits for the MCP thread to close its sessions
+MCP_SHUTDOWN_TIMEOUT_SECONDS = 10
+
+# How often chat() checks that the MCP loop is still alive while waiting for output
+_CHUNK_POLL_SECONDS = 1.0
+
 # Set up environment variables
 openrouter_api_key = os.getenv("OPENROUTER_API_KEY")
 if not openrouter_api_key:
@@ -44,73 +73,275 @@ llm = ChatOpenAI(
     temperature=0.7,
     api_key=SecretStr(openrouter_api_key),
     base_url=openrouter_base_url,
+    # Stream responses without the trailing usage chunk
+    streaming=True,
+    stream_usage=False,
+    # Fail fast instead of retrying slow requests for minutes
+    max_retries=1,
+    timeout=30,
 )
 
-# Global MCP session (managed by background thread)
-_mcp_session: ClientSession | None = None
+
+class MCPSessionPool:
+    """A fixed set of MCP client sessions shared by concurrent tool calls."""
+
+    def __init__(self, url: str, size: int):
+        self.url = url
+        self.size = max(1, size)
+        self._idle: asyncio.Queue[ClientSession] = asyncio.Queue()
+        self._stack = AsyncExitStack()
+        self._reload_task: asyncio.Task | None = None
+
+    async def __aenter__(self) -> "MCPSessionPool":
+        try:
+            for _ in range(self.size):
+                read, write = await self._stack.enter_async_context(sse_client(self.url))
+                session = await self._stack.enter_async_context(
+                    ClientSession(read, write, message_handler=self._handle_message)
+                )
+                await session.initialize()
+                self._idle.put_nowait(session)
+        except BaseException:
+            await self._stack.aclose()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._stack.aclose()
+
+    async def _handle_message(self, message) -> None:
+        """Reload the tools when the server says its tool list changed."""
+        if isinstance(message, types.ServerNotification) and isinstance(
+            message.root, types.ToolListChangedNotification
+        ):
+            # Every pooled session gets the notification; reload only once. The
+            # reload runs as its own task since this handler blocks the session's
+            # receive loop, which has to read the list_tools reply.
+            if self._reload_task is None or self._reload_task.done():
+                self._reload_task = asyncio.create_task(reload_tools(self))
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[ClientSession]:
+        """Check out an idle session, returning it to the pool afterwards."""
+        session = await self._idle.get()
+        try:
+            yield session
+        finally:
+            self._idle.put_nowait(session)
+
+
+# Global MCP session pool (managed by background thread)
+_mcp_pool: MCPSessionPool | None = None
 _mcp_loop: asyncio.AbstractEventLoop | None = None
 _dynamic_tools: list[StructuredTool] = []
 _agent = None
 
+# Tool list markdown for the UI, rendered whenever the tools are loaded
+_tool_list_md = "- No tools available"
+
+# Set once the agent is created and the app can start serving
+_ready = threading.Event()
+
+# Set (from the MCP loop) to close the MCP sessions
+_shutdown_event: asyncio.Event | None = None
 
-def _run_in_mcp_loop(coro):
-    """Run a coroutine in the MCP event loop."""
+# Background thread running the MCP loop, joined on shutdown
+_mcp_thread: threading.Thread | None = None
+
+# Per-session turn locks; an entry disappears once no turn is using it
+_turn_locks: weakref.WeakValueDictionary[str, threading.Lock] = weakref.WeakValueDictionary()
+_turn_locks_guard = threading.Lock()
+
+# Marks the end of a streamed agent turn in chat_async's queue
+_STREAM_END = object()
+
+# Args schema and validator per MCP tool schema, keyed by _schema_key()
+_args_cache: dict[str, tuple[type[BaseModel] | dict | None, Callable[[dict], dict] | None]] = {}
+
+# JSON Schema keywords that a flat TypedDict cannot express
+_COMPLEX_SCHEMA_KEYS = ("enum", "anyOf", "oneOf", "allOf", "$ref")
+
+# Map JSON schema types to Python types
+_JSON_TYPE_MAP = {
+    "string": str,
+    "integer": int,
+    "number": float,
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+}
+
+# Scalar property types that fastjsonschema can validate without Pydantic
+_PRIMITIVE_TYPES = frozenset({"string", "integer", "number", "boolean"})
+
+# Strings accepted for boolean arguments, as the Pydantic args model did
+_TRUE_STRINGS = frozenset({"1", "on", "t", "true", "y", "yes"})
+_FALSE_STRINGS = frozenset({"0", "f", "false", "n", "no", "off"})
+
+
+def _run_in_mcp_loop(coro, timeout: float | None = None):
+    """Run a coroutine in the MCP event loop and wait for its result."""
     if _mcp_loop is None:
         raise RuntimeError("MCP loop not initialized")
     future = asyncio.run_coroutine_threadsafe(coro, _mcp_loop)
-    return future.result(timeout=30)
+    try:
+        return future.result(timeout=timeout)
+    except BaseException:
+        # Stop the coroutine instead of leaving it running in the MCP loop
+        future.cancel()
+        raise
 
 
-def create_dynamic_tool(tool_name: str, tool_description: str, input_schema: dict) -> StructuredTool:
-    """
-    Dynamically create a LangChain StructuredTool from MCP tool definition.
+def _schema_key(tool_name: str, input_schema: dict) -> str:
+    """Hash a tool name and its input schema into a stable cache key."""
+    payload = json.dumps(input_schema, sort_keys=True).encode() + tool_name.encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _json_type(prop_info: dict) -> type:
+    """Map a JSON schema property type to a Python type; untyped properties accept anything."""
+    return _JSON_TYPE_MAP.get(prop_info.get("type"), Any)
+
+
+def _parse_bool(value: str) -> bool:
+    """Parse a boolean from its string form, raising ValueError if it isn't one."""
+    lowered = value.strip().lower()
+    if lowered in _TRUE_STRINGS:
+        return True
+    if lowered in _FALSE_STRINGS:
+        return False
+    raise ValueError(f"not a boolean: {value!r}")
+
+
+# Parsers for string values of non-string scalar properties
+_SCALAR_COERCERS = {"integer": int, "number": float, "boolean": _parse_bool}
+
+
+def _compile_validator(input_schema: dict, properties: dict) -> Callable[[dict], dict]:
     """
-    # Build Pydantic model from JSON schema
-    properties = input_schema.get("properties", {})
-    required = input_schema.get("required", [])
+    Compile a fastjsonschema validator for a scalar-only schema.
 
+    fastjsonschema doesn't coerce types, so string values of integer, number
+    and boolean properties (e.g. {"limit": "3"}) are parsed first, keeping
+    the lax behaviour of the Pydantic args model.
+    """
+    validate = fastjsonschema.compile(input_schema)
+    coercers = {
+        prop_name: _SCALAR_COERCERS[prop_info["type"]]
+        for prop_name, prop_info in properties.items()
+        if prop_info["type"] in _SCALAR_COERCERS
+    }
+    if not coercers:
+        return validate
+
+    def validate_coerced(arguments: dict) -> dict:
+        for prop_name, coerce in coercers.items():
+            value = arguments.get(prop_name)
+            if isinstance(value, str):
+                try:
+                    arguments = {**arguments, prop_name: coerce(value)}
+                except ValueError:
+                    pass  # Leave it for the validator to report
+        return validate(arguments)
+
+    return validate_coerced
+
+
+def _build_args_model(tool_name: str, properties: dict, required: list) -> type[BaseModel]:
+    """Build a Pydantic model for schemas that need full JSON Schema support."""
     fields = {}
     for prop_name, prop_info in properties.items():
-        prop_type = prop_info.get("type", "string")
         prop_desc = prop_info.get("description", "")
         default = ... if prop_name in required else None
+        fields[prop_name] = (_json_type(prop_info), Field(default=default, description=prop_desc))
+
+    return create_model(f"{tool_name}Args", **fields)
+
+
+def _build_args_adapter(tool_name: str, properties: dict, required: list) -> TypeAdapter:
+    """Build a pydantic-core validator for flat schemas from a TypedDict."""
+    annotations = {}
+    for prop_name, prop_info in properties.items():
+        python_type = _json_type(prop_info)
+        annotations[prop_name] = python_type if prop_name in required else NotRequired[python_type]
 
-        # Map JSON schema types to Python types
-        type_map = {
-            "string": str,
-            "integer": int,
-            "number": float,
-            "boolean": bool,
-        }
-        python_type = type_map.get(prop_type, str)
-        fields[prop_name] = (python_type, Field(default=default, description=prop_desc))
+    return TypeAdapter(TypedDict(f"{tool_name}Args", annotations))
 
-    # Create dynamic Pydantic model for args
-    ArgsModel = create_model(f"{tool_name}Args", **fields) if fields else None
 
-    # Create the function that calls the MCP tool
+def build_args_schema(
+    tool_name: str, input_schema: dict
+) -> tuple[type[BaseModel] | dict | None, Callable[[dict], dict] | None]:
+    """
+    Build (or reuse) the args schema and validator for an MCP tool.
+
+    Flat schemas are handed to LangChain as plain JSON Schema. When every
+    property is a scalar they are validated by a compiled fastjsonschema
+    validator, otherwise by a TypeAdapter, both avoiding the cost of
+    create_model. Schemas using enum/anyOf and similar keywords fall back
+    to a Pydantic model.
+    """
+    key = _schema_key(tool_name, input_schema)
+    if key in _args_cache:
+        return _args_cache[key]
+
+    properties = input_schema.get("properties", {})
+    required = input_schema.get("required", [])
+
+    if not properties:
+        args = (None, None)
+    elif any(k in prop_info for prop_info in properties.values() for k in _COMPLEX_SCHEMA_KEYS):
+        args = (_build_args_model(tool_name, properties, required), None)
+    elif all(prop_info.get("type") in _PRIMITIVE_TYPES for prop_info in properties.values()):
+        args = (input_schema, _compile_validator(input_schema, properties))
+    else:
+        adapter = _build_args_adapter(tool_name, properties, required)
+        args = (input_schema, adapter.validate_python)
+
+    _args_cache[key] = args
+    return args
+
+
+async def _call_tool_async(
+    tool_name: str, arguments: dict, validate_args: Callable[[dict], dict] | None = None
+) -> str:
+    """Validate arguments and call an MCP tool on a pooled session."""
+    if _mcp_pool is None:
+        return "Error: MCP session not initialized"
+
+    if validate_args is not None:
+        try:
+            arguments = validate_args(arguments)
+        except ValueError as e:
+            return f"Error: Invalid arguments for {tool_name}: {e}"
+
+    async with _mcp_pool.session() as session:
+        result = await session.call_tool(tool_name, arguments=arguments, read_timeout_seconds=TOOL_CALL_TIMEOUT)
+    if result.content:
+        # Extract text from content
+        return "\n".join(c.text for c in result.content if hasattr(c, "text")) or "No text result"
+    return "No result returned"
+
+
+def create_dynamic_tool(tool_name: str, tool_description: str, input_schema: dict) -> StructuredTool:
+    """
+    Dynamically create a LangChain StructuredTool from MCP tool definition.
+    """
+    args_schema, validate_args = build_args_schema(tool_name, input_schema)
+
+    # Create the coroutine that calls the MCP tool (used by the async agent)
+    async def acall_mcp_tool(**kwargs) -> str:
+        return await _call_tool_async(tool_name, kwargs, validate_args)
+
+    # Sync fallback for callers outside the MCP loop
     def call_mcp_tool(**kwargs) -> str:
-        if _mcp_session is None:
-            return "Error: MCP session not initialized"
-
-        async def _call():
-            result = await _mcp_session.call_tool(tool_name, arguments=kwargs)
-            if result.content:
-                # Extract text from content
-                texts = []
-                for c in result.content:
-                    if hasattr(c, "text"):
-                        texts.append(c.text)
-                return "\n".join(texts) if texts else "No text result"
-            return "No result returned"
-
-        return _run_in_mcp_loop(_call())
+        return _run_in_mcp_loop(_call_tool_async(tool_name, kwargs, validate_args))
 
     return StructuredTool(
         name=tool_name,
         description=tool_description,
         func=call_mcp_tool,
-        args_schema=ArgsModel,
+        coroutine=acall_mcp_tool,
+        args_schema=args_schema,
     )
 
 
@@ -130,6 +361,24 @@ async def load_tools_from_mcp(session: ClientSession) -> list[StructuredTool]:
 
     return tools
 
+
+async def reload_tools(pool: MCPSessionPool) -> None:
+    """Load the server's current tools and rebuild the agent around them."""
+    global _dynamic_tools, _agent, _tool_list_md
+
+    try:
+        async with pool.session() as session:
+            tools = await load_tools_from_mcp(session)
+    except Exception as e:
+        print(f"Failed to reload tools from MCP server: {e}")
+        return
+
+    _dynamic_tools = tools
+    tool_list, _tool_list_md = _render_tool_list(tools)
+    _agent = create_agent_with_tools(tools, tool_list)
+    print(f"Reloaded {len(tools)} tools after the MCP server's tool list changed")
+
+
 # System prompt template - will be populated with dynamic tools
 SYSTEM_PROMPT_TEMPLATE = """You are a helpful assistant with access to tools via MCP (Model Context Protocol).
 
@@ -145,66 +394,118 @@ to make sure that you reference the correct one.
 Be friendly and conversational."""
 
 
-def create_agent_with_tools(tools: list[StructuredTool]):
-    """Create a LangChain agent with the given tools."""
-    # Build tool list for system prompt
+def _render_tool_list(tools: list[StructuredTool]) -> tuple[str, str]:
+    """Render the tool list once for the system prompt and for the UI markdown."""
     tool_descriptions = []
+    tool_list_items = []
     for i, tool in enumerate(tools, 1):
-        tool_descriptions.append(f"{i}. **{tool.name}** - {tool.description.split(chr(10))[0]}")
-    
+        # Get first line of description
+        first_line = tool.description.split("\n")[0] if tool.description else ""
+        tool_descriptions.append(f"{i}. **{tool.name}** - {first_line}")
+
+        # Remove any pipe characters that could break markdown
+        desc = first_line.replace("|", "-").strip() or "No description"
+        tool_list_items.append(f"- **{tool.name}**: {desc}")
+
     tool_list = "\n".join(tool_descriptions)
+    tool_list_md = "\n".join(tool_list_items) if tool_list_items else "- No tools available"
+    return tool_list, tool_list_md
+
+
+def create_agent_with_tools(tools: list[StructuredTool], tool_list: str):
+    """Create a LangChain agent with the given tools, described by tool_list in the system prompt."""
     system_prompt = SYSTEM_PROMPT_TEMPLATE.format(tool_list=tool_list)
-    
     return create_agent(llm, tools, system_prompt=system_prompt)
 
 
-def convert_history_to_messages(history: list) -> list:
-    """Convert Gradio chat history to LangChain messages."""
-    messages = []
-    for msg in history:
-        if msg["role"] == "user":
-            messages.append(HumanMessage(content=msg["content"]))
-        elif msg["role"] == "assistant":
-            messages.append(AIMessage(content=msg["content"]))
-    return messages
+def _turn_lock(session_id: str) -> threading.Lock:
+    """
+    Get the lock serializing turns for one chat session.
+
+    A plain Lock rather than an RLock, since Gradio may resume the respond()
+    generator holding it on a different worker thread.
+    """
+    with _turn_locks_guard:
+        lock = _turn_locks.get(session_id)
+        if lock is None:
+            lock = threading.Lock()
+            _turn_locks[session_id] = lock
+        return lock
+
+
+async def _stream_turn(messages: list, chunks: queue.Queue) -> None:
+    """Stream one agent turn's events into chunks."""
+    events = _agent.astream_events({"messages": messages}, version="v2")  # type: ignore[arg-type]
+    async for event in events:
+        if event["event"] == "on_chat_model_stream":
+            content = event["data"]["chunk"].content
+            if content:
+                chunks.put(content)
+        elif event["event"] == "on_tool_start":
+            chunks.put(None)
+
+
+async def chat_async(messages: list, chunks: queue.Queue) -> None:
+    """
+    Run one agent turn inside the MCP loop, streaming the reply into chunks.
+
+    Text chunks are put on the queue as the LLM produces them. None is put
+    when a tool call starts, since any text before it isn't the final
+    answer, and _STREAM_END is always put last. The turn is cancelled if it
+    runs longer than CHAT_TURN_TIMEOUT_SECONDS.
+    """
+    try:
+        await asyncio.wait_for(_stream_turn(messages, chunks), CHAT_TURN_TIMEOUT_SECONDS)
+    finally:
+        chunks.put(_STREAM_END)
 
 
-def chat(message: str, history: list) -> str:
-    """Process a chat message and return the agent's response."""
-    if _agent is None:
-        return "Error: Agent not initialized. Please wait for MCP connection."
-    
-    # Convert history to LangChain messages
-    langchain_messages = convert_history_to_messages(history)
+def _next_chunk(chunks: queue.Queue, future) -> object:
+    """Wait for chat_async's next chunk, failing if the MCP loop can no longer deliver one."""
+    while True:
+        try:
+            return chunks.get(timeout=_CHUNK_POLL_SECONDS)
+        except queue.Empty:
+            if future.done():
+                # Finished without reaching chat_async's finally, e.g. cancelled before starting
+                return _STREAM_END
+            if _mcp_loop is None or not _mcp_loop.is_running():
+                raise RuntimeError("MCP connection is not running")
 
-    # Add the current user message
-    langchain_messages.append(HumanMessage(content=message))
 
-    try:
-        # Invoke the agent
-        result = _agent.invoke({"messages": langchain_messages})  # type: ignore[arg-type]
+def chat(messages: list) -> Iterator[str]:
+    """
+    Process a chat turn, yielding the agent's response so far as it streams.
 
-        # Get the last AI message content
-        response = result["messages"][-1].content
-        return response
+    messages is the conversation as LangChain messages, ending with the
+    current user message.
+    """
+    if _agent is None or _mcp_loop is None:
+        yield "Error: Agent not initialized. Please wait for MCP connection."
+        return
+
+    # Run the whole turn in the MCP loop so tool calls don't hop threads
+    chunks: queue.Queue = queue.Queue()
+    future = asyncio.run_coroutine_threadsafe(chat_async(messages, chunks), _mcp_loop)
+    response = ""
+    try:
+        while (chunk := _next_chunk(chunks, future)) is not _STREAM_END:
+            response = "" if chunk is None else response + chunk
+            yield response
+        future.result()
+    except asyncio.TimeoutError:
+        yield "Error: The assistant took too long to respond. Please try again."
     except Exception as e:
         import traceback
         traceback.print_exc()
-        return f"Error: {str(e)}"
+        yield f"Error: {str(e)}"
+    finally:
+        # Stop the turn if the UI stops listening early
+        future.cancel()
 
 
 # Create Gradio interface
 def create_ui():
-    tool_list_items = []
-    for tool in _dynamic_tools:
-        # Get first line of description, clean up any problematic characters
-        desc = tool.description.split("\n")[0] if tool.description else "No description"
-        # Remove any pipe characters that could break markdown
-        desc = desc.replace("|", "-").strip()
-        tool_list_items.append(f"- **{tool.name}**: {desc}")
-    
-    tool_list_md = "\n".join(tool_list_items) if tool_list_items else "- No tools available"
-    
     with gr.Blocks(title="AI Chat with MCP Tools") as block:
         gr.Markdown(
             f"""
@@ -213,7 +514,7 @@ def create_ui():
 Este assistente te ajuda a escolher sua próxima leitura. Você pode pedir sugestões de livros, autores ou navegar por gêneros.
 
 ### Ferramentas Disponíveis ({len(_dynamic_tools)}):
-{tool_list_md}
+{_tool_list_md}
 """
         )
 
@@ -234,20 +535,45 @@ Este assistente te ajuda a escolher sua próxima leitura. Você pode pedir suges
         with gr.Row():
             clear_btn = gr.Button("Limpar Chat")
 
+        # Conversation as LangChain messages, extended one turn at a time
+        # so the history is never converted again
+        lc_history = gr.State([])
+
         # Handle message submission
-        def respond(message: str, chat_history: list):
+        def respond(message: str, chat_history: list, messages: list, request: gr.Request):
             if not message.strip():
-                return "", chat_history
+                yield "", chat_history, messages
+                return
+
+            # Turns from the same session run one at a time, each adding its
+            # question and answer to the history together; other sessions don't wait
+            with _turn_lock(request.session_hash or ""):
+                messages.append(HumanMessage(content=message))
+                chat_history.append({"role": "user", "content": message})
+                chat_history.append({"role": "assistant", "content": ""})
 
-            bot_response = chat(message, chat_history)
-            chat_history.append({"role": "user", "content": message})
-            chat_history.append({"role": "assistant", "content": bot_response})
-            return "", chat_history
+                # Show the reply as it streams in
+                bot_response = ""
+                for bot_response in chat(messages):
+                    chat_history[-1]["content"] = bot_response
+                    yield "", chat_history, messages
+
+                messages.append(AIMessage(content=bot_response))
+                yield "", chat_history, messages
 
         # Connect events
-        msg.submit(respond, [msg, chatbot], [msg, chatbot])
-        submit_btn.click(respond, [msg, chatbot], [msg, chatbot])
-        clear_btn.click(lambda: [], outputs=[chatbot])
+        # Gradio runs one event at a time per listener by default; let as many
+        # turns run at once as there are pooled MCP sessions, sharing one limit
+        # across both ways of sending a message
+        msg.submit(
+            respond, [msg, chatbot, lc_history], [msg, chatbot, lc_history],
+            concurrency_limit=MCP_POOL_SIZE, concurrency_id="respond",
+        )
+        submit_btn.click(
+            respond, [msg, chatbot, lc_history], [msg, chatbot, lc_history],
+            concurrency_limit=MCP_POOL_SIZE, concurrency_id="respond",
+        )
+        clear_btn.click(lambda: ([], []), outputs=[chatbot, lc_history])
 
         gr.Markdown(
             """
@@ -260,61 +586,76 @@ Este assistente te ajuda a escolher sua próxima leitura. Você pode pedir suges
 
 
 async def run_mcp_session():
-    """Connect to the MCP server via SSE and keep the session alive."""
-    global _mcp_session, _dynamic_tools, _agent
+    """Connect to the MCP server via SSE and keep the session pool alive."""
+    global _mcp_pool, _dynamic_tools, _agent, _tool_list_md, _shutdown_event
 
     print(f"Connecting to MCP server at {MCP_SERVER_URL}...")
     
-    async with sse_client(MCP_SERVER_URL) as (read, write):
-        async with ClientSession(read, write) as session:
-            await session.initialize()
-            _mcp_session = session
-            print("MCP session initialized!")
-
-            # Dynamically load tools from the server
-            print("Loading tools from MCP server...")
+    async with MCPSessionPool(MCP_SERVER_URL, MCP_POOL_SIZE) as pool:
+        _mcp_pool = pool
+        print(f"MCP session pool initialized with {pool.size} sessions!")
+
+        # Dynamically load tools from the server
+        print("Loading tools from MCP server...")
+        async with pool.session() as session:
             _dynamic_tools = await load_tools_from_mcp(session)
-            print(f"Loaded {len(_dynamic_tools)} tools from MCP server")
+        print(f"Loaded {len(_dynamic_tools)} tools from MCP server")
+
+        # Render the tool list once for the system prompt and the UI
+        tool_list, _tool_list_md = _render_tool_list(_dynamic_tools)
 
-            # Create the agent with dynamic tools
-            _agent = create_agent_with_tools(_dynamic_tools)
-            print("Agent created with dynamic tools!")
+        # Create the agent with dynamic tools
+        _agent = create_agent_with_tools(_dynamic_tools, tool_list)
+        print("Agent created with dynamic tools!")
 
-            # Keep the session alive
-            while True:
-                await asyncio.sleep(1)
+        # Created before signalling readiness so stop_mcp() can always reach it
+        _shutdown_event = asyncio.Event()
+        _ready.set()
+
+        # Keep the sessions alive until stop_mcp() is called
+        await _shutdown_event.wait()
 
 
 def start_mcp_thread():
     """Start the MCP client connection in a background thread."""
-    global _mcp_loop
+    global _mcp_loop, _mcp_thread
 
     def run_loop():
         global _mcp_loop
-        _mcp_loop = asyncio.new_event_loop()
+        # Prefer uvloop's faster event loop when it is installed
+        _mcp_loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
         asyncio.set_event_loop(_mcp_loop)
         try:
             _mcp_loop.run_until_complete(run_mcp_session())
         except Exception as e:
             print(f"MCP connection error: {e}")
             print(f"Make sure the MCP server is running at {MCP_SERVER_URL}")
+        finally:
+            # Wake start_mcp_thread() right away if the connection failed
+            _ready.set()
 
-    thread = threading.Thread(target=run_loop, daemon=True)
-    thread.start()
+    _mcp_thread = threading.Thread(target=run_loop, daemon=True)
+    _mcp_thread.start()
 
-    # Wait for MCP session and agent to initialize
-    import time
-    for _ in range(60):  # Wait up to 30 seconds
-        if _agent is not None:
-            break
-        time.sleep(0.5)
-    else:
+    # Wait up to 30 seconds for MCP session and agent to initialize; _ready is
+    # also set when the thread gives up, in which case no agent was created
+    if not _ready.wait(timeout=30) or _agent is None:
         raise RuntimeError(
             f"Failed to connect to MCP server at {MCP_SERVER_URL}. "
             "Make sure the server is running with: python mcp_server.py"
         )
 
 
+def stop_mcp():
+    """Ask the MCP thread to close its sessions and wait for it to exit."""
+    if _mcp_loop is not None and _shutdown_event is not None:
+        _mcp_loop.call_soon_threadsafe(_shutdown_event.set)
+    # The thread is a daemon, so exiting without joining could cut the
+    # SSE sessions off before they are closed
+    if _mcp_thread is not None:
+        _mcp_thread.join(timeout=MCP_SHUTDOWN_TIMEOUT_SECONDS)
+
+
 def main():
     """Main entry point."""
     print("=" * 50)
@@ -327,7 +668,10 @@ def main():
 
     # Create and launch UI
     app = create_ui()
-    app.launch()
+    try:
+        app.launch()
+    finally:
+        stop_mcp()
 
 
 if __name__ == "__main__":
@@ -12,15 +12,247 @@ Server will be available at: http://localhost:8000/sse
 
 from mcp.server.fastmcp import FastMCP
 from datetime import datetime
+import asyncio
+import functools
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import threading
+import time
 import httpx
-from typing import Optional
+import orjson
+from collections import OrderedDict
+from dataclasses import dataclass
+from urllib.parse import urlencode
+from typing import Any, Hashable, Optional
 
 # Create the FastMCP server with HTTP transport
 mcp = FastMCP("Tools Server")
 
+# Tool call tracing is at DEBUG level, so it is skipped unless LOG_LEVEL asks for it
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+logger = logging.getLogger("mcp_server")
+
+# Open Library site and cover image URL parts
+_OL_BASE = "https://openlibrary.org"
+_COVERS_HOST = "https://covers.openlibrary.org"
+_COVER_BASE = _COVERS_HOST + "/b/id/"
+_COVER_SUFFIX = "-M.jpg"
+
+# Fixed parts of the per-subject and per-author API paths
+_SUBJECT_PREFIX = "/subjects/"
+_SUBJECT_SUFFIX = ".json"
+_AUTHOR_PREFIX = "/authors/"
+_AUTHOR_WORKS_SUFFIX = "/works.json"
+
+# Search result fields each tool reads, so Open Library can skip the rest
+_BOOK_FIELDS = "key,title,author_name,first_publish_year,edition_count,cover_i"
+_RECOMMENDATION_FIELDS = _BOOK_FIELDS + ",has_fulltext"
+
+# Sort orders passed through to Open Library search ("relevance" is the default)
+_SORT_VALID = frozenset({"new", "old", "rating"})
+
+# Open Library author IDs look like "OL23919A"
+_AUTHOR_ID_RE = re.compile(r"OL\d+A")
+
+# Per-result output templates, filled with str.format_map
+_BOOK_TMPL = (
+    "{i}. **{title}**\n"
+    "   Author(s): {authors}\n"
+    "   First Published: {first_year}\n"
+    "   Editions: {edition_count}\n"
+    "   Open Library: " + _OL_BASE + "{key}\n"
+    "   Cover: {cover_url}\n\n"
+)
+_AUTHOR_TMPL = (
+    "{i}. **{name}**\n"
+    "   Birth Date: {birth_date}\n"
+    "   Works: {work_count}\n"
+    "   Top Work: {top_work}\n"
+    "{subjects_line}"
+    "   Open Library: " + _OL_BASE + _AUTHOR_PREFIX + "{key}\n"
+    "   Photo: " + _COVERS_HOST + "/a/olid/{key}" + _COVER_SUFFIX + "\n\n"
+)
+_SUBJECT_WORK_TMPL = (
+    "{i}. **{title}**\n"
+    "   Author(s): {authors}\n"
+    "   Editions: {edition_count}\n"
+    "   Full text: {has_fulltext}\n"
+    "   Open Library: " + _OL_BASE + "{key}\n"
+    "   Cover: {cover_url}\n\n"
+)
+_WORK_TMPL = (
+    "{i}. **{title}**\n"
+    "   First Published: {first_publish}\n"
+    "{subjects_line}"
+    "   Open Library: " + _OL_BASE + "{key}\n"
+    "   Cover: {cover_url}\n\n"
+)
+_RECOMMENDATION_TMPL = (
+    "**{i}. {title}**\n"
+    "   By: {authors}\n"
+    "{year_line}"
+    "   Editions: {editions}\n"
+    "   Status: {availability}\n"
+    "   Link: " + _OL_BASE + "{key}\n"
+    "   Cover: {cover_url}\n\n"
+)
+
+# ============ Response Cache ============
+@dataclass
+class CacheEntry:
+    """A cached value and the time.monotonic() deadline it is valid until."""
+    value: Any
+    expires_at: float
+
+    def is_expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+
+class LRUCache:
+    """Thread-safe LRU cache whose entries expire after a TTL."""
+
+    def __init__(self, max_size: int = 512, default_ttl: float = 600):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.is_expired():
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.value
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entries when full."""
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            self._entries[key] = CacheEntry(value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> dict:
+        """Return the cache size and hit/miss counters."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+
+# How long Open Library responses are reused before being fetched again
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "600"))
+
+# Decoded Open Library responses, keyed by request path and query
+_http_cache = LRUCache(max_size=512, default_ttl=CACHE_TTL_SECONDS)
+
+# Formatted output of tools whose arguments repeat often, keyed by
+# (tool name, normalized arguments); only successful results are stored
+_result_cache = LRUCache(max_size=256, default_ttl=CACHE_TTL_SECONDS)
+
+# Tasks left running after a tool returns, referenced until they finish
+_background_tasks: set[asyncio.Task] = set()
+
+# Open Library fetches currently in flight, keyed like _http_cache
+_inflight: dict[str, asyncio.Task] = {}
+
+# Maximum number of simultaneous connections to Open Library
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "50"))
+
+# Shared HTTP client so tool calls reuse pooled keep-alive connections and
+# multiplex concurrent requests over HTTP/2
+_client = httpx.AsyncClient(
+    base_url=_OL_BASE,
+    http2=True,
+    # Fail fast on connect and pool waits, but give slow responses time to arrive
+    timeout=httpx.Timeout(connect=3.0, read=10.0, write=5.0, pool=5.0),
+    limits=httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=20,
+        keepalive_expiry=30.0,
+    ),
+    headers={"User-Agent": "library-assistant/1.0"},
+)
+
+
+def _cover(cover_id: Optional[int]) -> str:
+    """Build the medium-size cover image URL for a cover ID."""
+    return _COVER_BASE + str(cover_id) + _COVER_SUFFIX if cover_id else "No cover"
+
+
+def _run_in_background(task: asyncio.Task) -> None:
+    """Let a task finish after its caller has moved on, ignoring its outcome."""
+    _background_tasks.add(task)
+    task.add_done_callback(_forget_background_task)
+
+
+def _forget_background_task(task: asyncio.Task) -> None:
+    _background_tasks.discard(task)
+    if not task.cancelled():
+        task.exception()  # Mark any error as retrieved
+
+
+def _forget_inflight(key: str, task: asyncio.Task) -> None:
+    _inflight.pop(key, None)
+    if not task.cancelled():
+        task.exception()  # Mark any error as retrieved
+
+
+async def _fetch_json(path: str, params: dict, key: str) -> dict:
+    """Fetch and decode a JSON document from Open Library, caching it on success."""
+    # httpx takes care of URL-encoding the query parameters. Streaming lets
+    # the body be read (and decompressed) as it arrives; the connection goes
+    # back to the pool as soon as the block exits
+    async with _client.stream("GET", path, params=params) as response:
+        response.raise_for_status()
+        body = await response.aread()
+    data = orjson.loads(body)
+
+    # Only successful responses are cached
+    _http_cache.put(key, data)
+    return data
+
+
+async def _cached_get(path: str, params: dict) -> dict:
+    """Fetch a JSON document from Open Library, reusing recent responses."""
+    key = path + "?" + urlencode(sorted(params.items()))
+    data = _http_cache.get(key)
+    if data is not None:
+        return data
+
+    # Join an identical request that is already in flight instead of
+    # sending another one
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_json(path, params, key))
+        _inflight[key] = task
+        task.add_done_callback(functools.partial(_forget_inflight, key))
+
+    # Shielded so a caller giving up doesn't cancel the fetch for the others
+    return await asyncio.shield(task)
+
+
 # ============ Open Library: Search Books ============
 @mcp.tool()
-def search_books(query: str, limit: int = 5, sort: str = "relevance") -> str:
+async def search_books(query: str, limit: int = 5, sort: str = "relevance") -> str:
     """
     Search for books on Open Library.
 
@@ -32,23 +264,18 @@ def search_books(query: str, limit: int = 5, sort: str = "relevance") -> str:
     Returns:
         A formatted list of books matching the search query
     """
-    print("Tool search_books called")
+    logger.debug("tool %s called", "search_books")
+    query = query.strip()
+    if not query:
+        return "Error: Empty search query"
     limit = min(max(1, limit), 20)  # Clamp between 1 and 20
     
-    sort_param = ""
-    if sort == "new":
-        sort_param = "&sort=new"
-    elif sort == "old":
-        sort_param = "&sort=old"
-    elif sort == "rating":
-        sort_param = "&sort=rating"
-    
-    url = f"https://openlibrary.org/search.json?q={query}&limit={limit}{sort_param}"
+    params = {"q": query, "limit": limit, "fields": _BOOK_FIELDS}
+    if sort in _SORT_VALID:
+        params["sort"] = sort
     
     try:
-        response = httpx.get(url, timeout=10.0)
-        response.raise_for_status()
-        data = response.json()
+        data = await _cached_get("/search.json", params)
         
         num_found = data.get("num_found", 0)
         docs = data.get("docs", [])
@@ -56,37 +283,33 @@ def search_books(query: str, limit: int = 5, sort: str = "relevance") -> str:
         if not docs:
             return f"No books found for query: '{query}'"
         
-        result = f"Found {num_found} books for '{query}'. Showing top {len(docs)}:\n\n"
+        parts = [f"Found {num_found} books for '{query}'. Showing top {len(docs)}:\n\n"]
         
         for i, book in enumerate(docs, 1):
-            title = book.get("title", "Unknown Title")
-            authors = ", ".join(book.get("author_name", ["Unknown Author"]))
-            first_year = book.get("first_publish_year", "N/A")
-            edition_count = book.get("edition_count", 0)
-            key = book.get("key", "")
-            
-            # Get cover URL if available
-            cover_id = book.get("cover_i")
-            cover_url = f"https://covers.openlibrary.org/b/id/{cover_id}-M.jpg" if cover_id else "No cover"
-            
-            result += f"{i}. **{title}**\n"
-            result += f"   Author(s): {authors}\n"
-            result += f"   First Published: {first_year}\n"
-            result += f"   Editions: {edition_count}\n"
-            result += f"   Open Library: https://openlibrary.org{key}\n"
-            result += f"   Cover: {cover_url}\n\n"
+            g = book.get
+            parts.append(_BOOK_TMPL.format_map({
+                "i": i,
+                "title": g("title", "Unknown Title"),
+                "authors": ", ".join(g("author_name", ["Unknown Author"])),
+                "first_year": g("first_publish_year", "N/A"),
+                "edition_count": g("edition_count", 0),
+                "key": g("key", ""),
+                "cover_url": _cover(g("cover_i")),
+            }))
         
-        return result
+        return "".join(parts)
         
     except httpx.TimeoutException:
         return f"Error: Request timed out while searching for '{query}'"
+    except httpx.HTTPError as e:
+        return f"Error: Open Library request failed while searching for '{query}': {str(e)}"
     except Exception as e:
         return f"Error searching for books: {str(e)}"
 
 
 # ============ Open Library: Search Authors ============
 @mcp.tool()
-def search_authors(query: str, limit: int = 5) -> str:
+async def search_authors(query: str, limit: int = 5) -> str:
     """
     Search for authors on Open Library.
 
@@ -97,15 +320,16 @@ def search_authors(query: str, limit: int = 5) -> str:
     Returns:
         A formatted list of authors matching the search query with their top works
     """
-    print("Tool search_authors called")
+    logger.debug("tool %s called", "search_authors")
+    query = query.strip()
+    if not query:
+        return "Error: Empty author query"
     limit = min(max(1, limit), 20)
     
-    url = f"https://openlibrary.org/search/authors.json?q={query}&limit={limit}"
+    params = {"q": query, "limit": limit}
     
     try:
-        response = httpx.get(url, timeout=10.0)
-        response.raise_for_status()
-        data = response.json()
+        data = await _cached_get("/search/authors.json", params)
         
         num_found = data.get("numFound", 0)
         docs = data.get("docs", [])
@@ -113,36 +337,35 @@ def search_authors(query: str, limit: int = 5) -> str:
         if not docs:
             return f"No authors found for query: '{query}'"
         
-        result = f"Found {num_found} authors for '{query}'. Showing top {len(docs)}:\n\n"
+        parts = [f"Found {num_found} authors for '{query}'. Showing top {len(docs)}:\n\n"]
         
         for i, author in enumerate(docs, 1):
-            name = author.get("name", "Unknown")
-            key = author.get("key", "")
-            birth_date = author.get("birth_date", "N/A")
-            top_work = author.get("top_work", "N/A")
-            work_count = author.get("work_count", 0)
-            top_subjects = author.get("top_subjects", [])[:5]
+            g = author.get
+            top_subjects = g("top_subjects", [])[:5]
             
-            result += f"{i}. **{name}**\n"
-            result += f"   Birth Date: {birth_date}\n"
-            result += f"   Works: {work_count}\n"
-            result += f"   Top Work: {top_work}\n"
-            if top_subjects:
-                result += f"   Subjects: {', '.join(top_subjects)}\n"
-            result += f"   Open Library: https://openlibrary.org/authors/{key}\n"
-            result += f"   Photo: https://covers.openlibrary.org/a/olid/{key}-M.jpg\n\n"
+            parts.append(_AUTHOR_TMPL.format_map({
+                "i": i,
+                "name": g("name", "Unknown"),
+                "key": g("key", ""),
+                "birth_date": g("birth_date", "N/A"),
+                "top_work": g("top_work", "N/A"),
+                "work_count": g("work_count", 0),
+                "subjects_line": f"   Subjects: {', '.join(top_subjects)}\n" if top_subjects else "",
+            }))
         
-        return result
+        return "".join(parts)
         
     except httpx.TimeoutException:
         return f"Error: Request timed out while searching for author '{query}'"
+    except httpx.HTTPError as e:
+        return f"Error: Open Library request failed while searching for author '{query}': {str(e)}"
     except Exception as e:
         return f"Error searching for authors: {str(e)}"
 
 
 # ============ Open Library: Browse by Subject ============
 @mcp.tool()
-def browse_subject(subject: str, limit: int = 5, ebooks_only: bool = False) -> str:
+async def browse_subject(subject: str, limit: int = 5, ebooks_only: bool = False) -> str:
     """
     Browse books by subject/genre on Open Library.
 
@@ -155,19 +378,27 @@ def browse_subject(subject: str, limit: int = 5, ebooks_only: bool = False) -> s
     Returns:
         A formatted list of popular books in the given subject
     """
-    print("Tool browse_subject called")
+    logger.debug("tool %s called", "browse_subject")
+    subject = subject.strip()
+    if not subject:
+        return "Error: Empty subject"
     limit = min(max(1, limit), 20)
     
     # Format subject for URL (replace spaces with underscores, lowercase)
     subject_formatted = subject.lower().replace(" ", "_")
     
-    ebooks_param = "&ebooks=true" if ebooks_only else ""
-    url = f"https://openlibrary.org/subjects/{subject_formatted}.json?limit={limit}{ebooks_param}&details=true"
+    # Skip the fetch and formatting entirely for a recently answered request
+    result_key = ("browse_subject", subject_formatted, limit, ebooks_only)
+    result = _result_cache.get(result_key)
+    if result is not None:
+        return result
+    
+    params = {"limit": limit, "details": "true"}
+    if ebooks_only:
+        params["ebooks"] = "true"
     
     try:
-        response = httpx.get(url, timeout=10.0)
-        response.raise_for_status()
-        data = response.json()
+        data = await _cached_get(_SUBJECT_PREFIX + subject_formatted + _SUBJECT_SUFFIX, params)
         
         subject_name = data.get("name", subject)
         work_count = data.get("work_count", 0)
@@ -176,51 +407,48 @@ def browse_subject(subject: str, limit: int = 5, ebooks_only: bool = False) -> s
         if not works:
             return f"No books found for subject: '{subject}'. Try subjects like: science_fiction, romance, mystery, fantasy, biography, history, love, adventure"
         
-        result = f"**{subject_name}** - {work_count} total works\n"
-        result += f"Showing top {len(works)} books:\n\n"
+        parts = [f"**{subject_name}** - {work_count} total works\nShowing top {len(works)} books:\n\n"]
         
         for i, work in enumerate(works, 1):
-            title = work.get("title", "Unknown Title")
-            authors = work.get("authors", [])
-            author_names = ", ".join([a.get("name", "Unknown") for a in authors]) if authors else "Unknown Author"
-            edition_count = work.get("edition_count", 0)
-            key = work.get("key", "")
-            has_fulltext = "Available" if work.get("has_fulltext") else "Not available"
-            cover_id = work.get("cover_id")
-            cover_url = f"https://covers.openlibrary.org/b/id/{cover_id}-M.jpg" if cover_id else "No cover"
+            g = work.get
+            authors = g("authors", [])
             
-            result += f"{i}. **{title}**\n"
-            result += f"   Author(s): {author_names}\n"
-            result += f"   Editions: {edition_count}\n"
-            result += f"   Full text: {has_fulltext}\n"
-            result += f"   Open Library: https://openlibrary.org{key}\n"
-            result += f"   Cover: {cover_url}\n\n"
+            parts.append(_SUBJECT_WORK_TMPL.format_map({
+                "i": i,
+                "title": g("title", "Unknown Title"),
+                "authors": ", ".join([a.get("name", "Unknown") for a in authors]) if authors else "Unknown Author",
+                "edition_count": g("edition_count", 0),
+                "key": g("key", ""),
+                "has_fulltext": "Available" if g("has_fulltext") else "Not available",
+                "cover_url": _cover(g("cover_id")),
+            }))
         
         # Add related subjects if available
         related_subjects = data.get("subjects", [])[:5]
         if related_subjects:
-            result += "**Related Subjects:** "
-            result += ", ".join([s.get("name", "") for s in related_subjects])
-            result += "\n"
+            parts.append(f"**Related Subjects:** {', '.join([s.get('name', '') for s in related_subjects])}\n")
         
         # Add top authors in this subject if available
         top_authors = data.get("authors", [])[:3]
         if top_authors:
-            result += "**Top Authors in this Subject:** "
-            result += ", ".join([f"{a.get('name', '')} ({a.get('count', 0)} works)" for a in top_authors])
-            result += "\n"
+            top_author_names = ", ".join([f"{a.get('name', '')} ({a.get('count', 0)} works)" for a in top_authors])
+            parts.append(f"**Top Authors in this Subject:** {top_author_names}\n")
         
+        result = "".join(parts)
+        _result_cache.put(result_key, result)
         return result
         
     except httpx.TimeoutException:
         return f"Error: Request timed out while browsing subject '{subject}'"
+    except httpx.HTTPError as e:
+        return f"Error: Open Library request failed while browsing subject '{subject}': {str(e)}"
     except Exception as e:
         return f"Error browsing subject: {str(e)}"
 
 
 # ============ Open Library: Get Author Works ============
 @mcp.tool()
-def get_author_works(author_id: str, limit: int = 10) -> str:
+async def get_author_works(author_id: str, limit: int = 10) -> str:
     """
     Get works by a specific author using their Open Library ID.
 
@@ -231,55 +459,65 @@ def get_author_works(author_id: str, limit: int = 10) -> str:
     Returns:
         A formatted list of works by the author
     """
-    print("Tool get_author_works called")
+    logger.debug("tool %s called", "get_author_works")
     limit = min(max(1, limit), 50)
     
     # Clean up author_id if full path is provided
+    author_id = author_id.strip()
     if "/" in author_id:
         author_id = author_id.split("/")[-1]
     
-    url = f"https://openlibrary.org/authors/{author_id}/works.json?limit={limit}"
+    # Reject malformed IDs before they reach Open Library
+    if not _AUTHOR_ID_RE.fullmatch(author_id):
+        return f"Error: Invalid author ID format: '{author_id}'"
+    
+    # Skip the fetch and formatting entirely for a recently answered request
+    result_key = ("get_author_works", author_id, limit)
+    result = _result_cache.get(result_key)
+    if result is not None:
+        return result
     
     try:
-        response = httpx.get(url, timeout=10.0)
-        response.raise_for_status()
-        data = response.json()
+        data = await _cached_get(_AUTHOR_PREFIX + author_id + _AUTHOR_WORKS_SUFFIX, {"limit": limit})
         
         entries = data.get("entries", [])
         
         if not entries:
             return f"No works found for author ID: '{author_id}'"
         
-        result = f"Works by author {author_id}:\n\n"
+        parts = [f"Works by author {author_id}:\n\n"]
         
         for i, work in enumerate(entries, 1):
-            title = work.get("title", "Unknown Title")
-            key = work.get("key", "")
-            subjects = work.get("subjects", [])[:3]
-            first_publish = work.get("first_publish_date", "N/A")
+            g = work.get
+            subjects = g("subjects", [])[:3]
             
             # Get cover
-            covers = work.get("covers", [])
-            cover_url = f"https://covers.openlibrary.org/b/id/{covers[0]}-M.jpg" if covers else "No cover"
+            covers = g("covers", [])
             
-            result += f"{i}. **{title}**\n"
-            result += f"   First Published: {first_publish}\n"
-            if subjects:
-                result += f"   Subjects: {', '.join(subjects)}\n"
-            result += f"   Open Library: https://openlibrary.org{key}\n"
-            result += f"   Cover: {cover_url}\n\n"
+            parts.append(_WORK_TMPL.format_map({
+                "i": i,
+                "title": g("title", "Unknown Title"),
+                "key": g("key", ""),
+                "first_publish": g("first_publish_date", "N/A"),
+                "subjects_line": f"   Subjects: {', '.join(subjects)}\n" if subjects else "",
+                "cover_url": _cover(covers[0] if covers else None),
+            }))
         
+        result = "".join(parts)
+        _result_cache.put(result_key, result)
         return result
         
     except httpx.TimeoutException:
         return f"Error: Request timed out while fetching works for author '{author_id}'"
+    except httpx.HTTPError as e:
+        return f"Error: Open Library request failed while fetching works for author '{author_id}': {str(e)}"
     except Exception as e:
         return f"Error getting author works: {str(e)}"
 
 
 # ============ Open Library: Book Recommendations ============
 @mcp.tool()
-def recommend_books(interest: str, limit: int = 5) -> str:
+async def recommend_books(interest: str, limit: int = 5) -> str:
     """
     Get book recommendations based on an interest, genre, or topic.
     This combines subject browsing with search to find popular and relevant books.
@@ -292,90 +530,97 @@ def recommend_books(interest: str, limit: int = 5) -> str:
     Returns:
         Curated book recommendations with details
     """
-    print("Tool recommend_books called")
+    logger.debug("tool %s called", "recommend_books")
+    interest = interest.strip()
+    if not interest:
+        return "Error: Empty interest"
     limit = min(max(1, limit), 10)
     
-    # Try subject first, then fall back to search
+    # Subject results come first, search results fill in behind them
     subject_formatted = interest.lower().replace(" ", "_")
+    subject_params = {"limit": limit}
+    search_params = {"q": interest, "limit": limit, "sort": "rating", "fields": _RECOMMENDATION_FIELDS}
+    
+    # Both lookups are independent, so start them concurrently
+    subject_task = asyncio.ensure_future(_cached_get(_SUBJECT_PREFIX + subject_formatted + _SUBJECT_SUFFIX, subject_params))
+    search_task = asyncio.ensure_future(_cached_get("/search.json", search_params))
     
     results = []
     
-    # Try subject browsing
     try:
-        subject_url = f"https://openlibrary.org/subjects/{subject_formatted}.json?limit={limit}"
-        response = httpx.get(subject_url, timeout=10.0)
-        if response.status_code == 200:
-            data = response.json()
-            works = data.get("works", [])
-            for work in works:
-                results.append({
-                    "title": work.get("title", "Unknown"),
-                    "authors": ", ".join([a.get("name", "Unknown") for a in work.get("authors", [])]),
-                    "editions": work.get("edition_count", 0),
-                    "key": work.get("key", ""),
-                    "cover_id": work.get("cover_id"),
-                    "has_fulltext": work.get("has_fulltext", False)
-                })
-    except:
-        pass
+        subject_data = await subject_task
+    except Exception:
+        subject_data = None
     
-    # If not enough results, supplement with search
-    if len(results) < limit:
+    if subject_data is not None:
+        for work in subject_data.get("works", []):
+            g = work.get
+            results.append({
+                "title": g("title", "Unknown"),
+                "authors": ", ".join([a.get("name", "Unknown") for a in g("authors", [])]),
+                "editions": g("edition_count", 0),
+                "key": g("key", ""),
+                "cover_id": g("cover_id"),
+                "has_fulltext": g("has_fulltext", False)
+            })
+    
+    # When the subject alone fills the list, don't wait for the search; it
+    # finishes in the background so its response still lands in the cache
+    if len({r["title"].lower() for r in results}) >= limit:
+        _run_in_background(search_task)
+        search_data = None
+    else:
         try:
-            search_url = f"https://openlibrary.org/search.json?q={interest}&limit={limit - len(results)}&sort=rating"
-            response = httpx.get(search_url, timeout=10.0)
-            if response.status_code == 200:
-                data = response.json()
-                for book in data.get("docs", []):
-                    results.append({
-                        "title": book.get("title", "Unknown"),
-                        "authors": ", ".join(book.get("author_name", ["Unknown"])),
-                        "editions": book.get("edition_count", 0),
-                        "key": book.get("key", ""),
-                        "cover_id": book.get("cover_i"),
-                        "has_fulltext": book.get("has_fulltext", False),
-                        "first_year": book.get("first_publish_year"),
-                        "key": book.get("key", "")
-                    })
-        except:
-            pass
+            search_data = await search_task
+        except Exception:
+            search_data = None
+    
+    if search_data is not None:
+        for book in search_data.get("docs", []):
+            g = book.get
+            results.append({
+                "title": g("title", "Unknown"),
+                "authors": ", ".join(g("author_name", ["Unknown"])),
+                "editions": g("edition_count", 0),
+                "key": g("key", ""),
+                "cover_id": g("cover_i"),
+                "has_fulltext": g("has_fulltext", False),
+                "first_year": g("first_publish_year")
+            })
     
     if not results:
         return f"Sorry, I couldn't find recommendations for '{interest}'. Try different keywords like: science fiction, mystery, romance, history, biography, cooking, self-help"
     
-    output = f"**Book Recommendations for '{interest}'**\n\n"
+    parts = [f"**Book Recommendations for '{interest}'**\n\n"]
     
-    # Remove duplicates based on title
+    # Skip duplicate titles and stop as soon as the list is full
     seen_titles = set()
-    unique_results = []
-    for r in results:
-        if r["title"].lower() not in seen_titles:
-            seen_titles.add(r["title"].lower())
-            unique_results.append(r)
-    
-    for i, book in enumerate(unique_results[:limit], 1):
-        cover_url = f"https://covers.openlibrary.org/b/id/{book['cover_id']}-M.jpg" if book.get('cover_id') else "No cover"
-        availability = "Available online" if book.get("has_fulltext") else "Print only"
+    for book in results:
+        title_key = book["title"].lower()
+        if title_key in seen_titles:
+            continue
+        seen_titles.add(title_key)
         
-        output += f"**{i}. {book['title']}**\n"
-        output += f"   By: {book['authors']}\n"
-        if book.get("first_year"):
-            output += f"   Year: {book['first_year']}\n"
-        output += f"   Editions: {book['editions']}\n"
-        output += f"   Status: {availability}\n"
-        output += f"   Link: https://openlibrary.org{book['key']}\n"
-        output += f"   Cover: {cover_url}\n\n"
+        parts.append(_RECOMMENDATION_TMPL.format_map({
+            "i": len(seen_titles),
+            "title": book["title"],
+            "authors": book["authors"],
+            "year_line": f"   Year: {book['first_year']}\n" if book.get("first_year") else "",
+            "editions": book["editions"],
+            "availability": "Available online" if book.get("has_fulltext") else "Print only",
+            "key": book["key"],
+            "cover_url": _cover(book.get("cover_id")),
+        }))
+        if len(seen_titles) >= limit:
+            break
     
-    output += "**Tip:** Use search_books() for more specific searches, or browse_subject() to explore genres!"
+    parts.append("**Tip:** Use search_books() for more specific searches, or browse_subject() to explore genres!")
     
-    return output
+    return "".join(parts)
 
 
 # ============ Resource: Server Info ============
-@mcp.resource("server://info")
-def get_server_info() -> str:
-    """Get information about this MCP server."""
-    return """
+_SERVER_INFO = """
 # Tools Server
 
 This MCP server provides the following tools:
@@ -392,10 +637,30 @@ Powered by Open Library API (https://openlibrary.org)
 """
 
 
+@mcp.resource("server://info")
+def get_server_info() -> str:
+    """Get information about this MCP server."""
+    return _SERVER_INFO
+
+
+# ============ Resource: Cache Stats ============
+@mcp.resource("cache://stats")
+def get_cache_stats() -> str:
+    """Get hit/miss statistics for the Open Library response cache."""
+    stats = _http_cache.get_stats()
+    return f"""
+# Open Library Response Cache
+
+- Entries: {stats["size"]} / {stats["max_size"]}
+- Hits: {stats["hits"]}
+- Misses: {stats["misses"]}
+- Hit rate: {stats["hit_rate"]:.1%}
+- TTL: {CACHE_TTL_SECONDS}s
+"""
+
+
 # ============ Prompt Template ============
-@mcp.prompt()
-def assistant_prompt() -> str:
-    return """You are a friendly and knowledgeable librarian assistant specializing in book discovery and recommendations.
+_ASSISTANT_PROMPT = """You are a friendly and knowledgeable librarian assistant specializing in book discovery and recommendations.
 
     ## Your Expertise
     - Help users discover books based on their interests, mood, or reading goals
@@ -454,6 +719,42 @@ def assistant_prompt() -> str:
 
     Remember: You're not just a search engine - you're a passionate reading guide helping people discover their next favorite book!"""
 
+
+@mcp.prompt()
+def assistant_prompt() -> str:
+    return _ASSISTANT_PROMPT
+
+
+def _start_logging() -> logging.handlers.QueueListener:
+    """Send log records through a queue so writing them never blocks the event loop."""
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    
+    # getLevelName() maps known level names to their number and anything else to a string
+    level = logging.getLevelName(LOG_LEVEL)
+    
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(level if isinstance(level, int) else logging.INFO)
+    logger.propagate = False
+    
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    if not isinstance(level, int):
+        logger.warning("Unknown LOG_LEVEL %r, logging at INFO", LOG_LEVEL)
+    return listener
+
+
+async def _serve() -> None:
+    """Run the SSE server and release pooled HTTP connections on shutdown."""
+    listener = _start_logging()
+    try:
+        await mcp.run_sse_async()
+    finally:
+        await _client.aclose()
+        listener.stop()
+
+
 if __name__ == "__main__":
     # Run the server with SSE transport over HTTP
     print("=" * 50)
@@ -465,4 +766,4 @@ if __name__ == "__main__":
     print("=" * 50)
     
     # Run with SSE transport (HTTP)
-    mcp.run(transport="sse")
+    asyncio.run(_serve())